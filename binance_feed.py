@@ -1,95 +1,134 @@
 """Binance WebSocket price feed for BTC/USDT."""
-import json
+import asyncio
+import socket
 import threading
 import time
-import websocket
+import msgspec
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
 from config import Config
+from feed_hub import FeedHub
 from logger import logger
 
+# bookTicker frames are ~150 bytes; anything far larger is not a ticker
+MAX_FRAME_SIZE = 4096
+
+# Keepalive: ping every 20s and drop the connection if no pong within 10s
+PING_INTERVAL = 20
+PING_TIMEOUT = 10
+
+class BookTicker(msgspec.Struct):
+    """Best bid/ask fields of a Binance bookTicker frame."""
+    b: float = 0.0  # Best bid (sent as a string, coerced by the decoder)
+    a: float = 0.0  # Best ask
+
+# Compiled once: decodes straight into BookTicker, ignoring unused fields
+_BOOK_TICKER_DECODER = msgspec.json.Decoder(BookTicker, strict=False)
+
 class BinanceFeed:
     """Binance WebSocket price feed."""
     
-    def __init__(self, symbol="BTCUSDT"):
+    def __init__(self, symbol="BTCUSDT", hub=None):
         """
         Initialize Binance feed.
         
         Args:
             symbol: Trading pair (default: BTCUSDT)
+            hub: Shared FeedHub to run on (default: a private hub owned by this feed)
         """
         self.symbol = symbol
+        self.hub = hub or FeedHub()
+        self._owns_hub = hub is None
         self.ws = None
-        self.price = None
-        self.last_update = 0
+        self.loop = None
+        # (price, last_update) published with a single store so readers never see a torn pair
+        self._state = (None, 0)
         self.running = False
-        self.thread = None
-        self.callbacks = []
+        self.callbacks = ()  # Immutable so on_message can iterate without copying
+        self._future = None
+        self._first_price = threading.Event()
+        self._tick_event = threading.Event()  # Set on every price update
         
         logger.info(f"Binance feed initialized for {symbol}")
     
-    def on_message(self, ws, message):
+    def on_message(self, message):
         """Handle incoming WebSocket message."""
         try:
-            data = json.loads(message)
+            # Binance bookTicker format: {"u":400900217,"s":"BTCUSDT","b":"50000.00","B":"1.2","a":"50000.01","A":"0.8"}
+            ticker = _BOOK_TICKER_DECODER.decode(message)
             
-            # Binance ticker format: {"e":"24hrTicker","E":1234567890,"s":"BTCUSDT","c":"50000.00",...}
-            if data.get("e") == "24hrTicker":
-                price = float(data.get("c", 0))  # 'c' = current close price
+            # Frames without a bid/ask (e.g. control replies) decode to zeros
+            if ticker.b and ticker.a:
+                # Mid of best bid ('b') and best ask ('a')
+                price = (ticker.b + ticker.a) / 2
                 
                 if price > 0:
-                    self.price = price
-                    self.last_update = time.time()
+                    self._state = (price, time.monotonic())
+                    self._tick_event.set()
+                    if not self._first_price.is_set():
+                        self._first_price.set()
                     
-                    # Call registered callbacks
-                    for callback in self.callbacks:
-                        try:
-                            callback(price)
-                        except Exception as e:
-                            logger.error(f"Callback error: {e}")
-            
+                    # Schedule callbacks so a slow consumer cannot stall the read loop
+                    callbacks = self.callbacks
+                    if callbacks:
+                        call_soon, dispatch = self.loop.call_soon, self._dispatch
+                        for callback in callbacks:
+                            call_soon(dispatch, callback, price)
+        
         except Exception as e:
             logger.error(f"Error processing Binance message: {e}")
     
-    def on_error(self, ws, error):
+    def _dispatch(self, callback, price):
+        """Invoke a registered callback on the event loop."""
+        try:
+            callback(price)
+        except Exception as e:
+            logger.error(f"Callback error: {e}")
+    
+    def on_error(self, error):
         """Handle WebSocket error."""
         logger.error(f"Binance WebSocket error: {error}")
     
-    def on_close(self, ws, close_status_code, close_msg):
-        """Handle WebSocket close."""
-        logger.warning("Binance WebSocket closed")
-        
-        # Auto-reconnect if still running
-        if self.running:
-            logger.info("Reconnecting to Binance in 5 seconds...")
-            time.sleep(5)
-            self._connect()
-    
-    def on_open(self, ws):
+    def on_open(self):
         """Handle WebSocket open."""
         logger.info("✅ Connected to Binance WebSocket")
     
-    def _connect(self):
-        """Create WebSocket connection."""
-        # Binance WebSocket URL format: wss://stream.binance.com:9443/ws/btcusdt@ticker
-        ws_url = f"wss://stream.binance.com:9443/ws/{self.symbol.lower()}@ticker"
+    async def _run_async(self):
+        """Read ticker messages, reconnecting until the feed is stopped."""
+        # Binance WebSocket URL format: wss://stream.binance.com:9443/ws/btcusdt@bookTicker
+        ws_url = f"wss://stream.binance.com:9443/ws/{self.symbol.lower()}@bookTicker"
         
-        self.ws = websocket.WebSocketApp(
-            ws_url,
-            on_message=self.on_message,
-            on_error=self.on_error,
-            on_close=self.on_close,
-            on_open=self.on_open
-        )
-    
-    def _run(self):
-        """Run WebSocket in thread."""
         while self.running:
             try:
-                self._connect()
-                self.ws.run_forever()
+                # bookTicker frames are small, so skip permessage-deflate and its zlib cost
+                async with connect(
+                    ws_url,
+                    compression=None,
+                    max_size=MAX_FRAME_SIZE,
+                    ping_interval=PING_INTERVAL,
+                    ping_timeout=PING_TIMEOUT,
+                ) as ws:
+                    # Disable Nagle explicitly (whichever event loop is in use)
+                    sock = ws.transport.get_extra_info("socket")
+                    if sock is not None:
+                        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    
+                    self.ws = ws
+                    self.on_open()
+                    while True:
+                        # Keep raw frame bytes (no UTF-8 decode to str first)
+                        self.on_message(await ws.recv(decode=False))
+            except ConnectionClosed:
+                logger.warning("Binance WebSocket closed")
             except Exception as e:
-                logger.error(f"Binance WebSocket error: {e}")
-                if self.running:
-                    time.sleep(5)
+                self.on_error(e)
+            finally:
+                self.ws = None
+            
+            # Auto-reconnect if still running
+            if self.running:
+                logger.info("Reconnecting to Binance in 5 seconds...")
+                await asyncio.sleep(5)
     
     def start(self):
         """Start the WebSocket feed."""
@@ -98,17 +137,19 @@ class BinanceFeed:
             return
         
         self.running = True
-        self.thread = threading.Thread(target=self._run, daemon=True)
-        self.thread.start()
+        
+        # Bind the hub loop before the reader is scheduled, since on_message
+        # dispatches callbacks through it
+        self.hub.start()
+        self.loop = self.hub.loop
+        self._future = self.hub.add(self._run_async)
         
         # Wait for first price update
-        timeout = 10
-        start = time.time()
-        while self.price is None and (time.time() - start) < timeout:
-            time.sleep(0.1)
+        self._first_price.wait(timeout=10)
         
-        if self.price:
-            logger.info(f"✅ Binance feed started: BTC ${self.price:,.2f}")
+        price = self.get_price()
+        if price:
+            logger.info(f"✅ Binance feed started: BTC ${price:,.2f}")
         else:
             logger.warning("Binance feed started but no price received yet")
     
@@ -117,11 +158,12 @@ class BinanceFeed:
         logger.info("Stopping Binance feed...")
         self.running = False
         
-        if self.ws:
-            self.ws.close()
+        # Cancelling the reader task closes the WebSocket
+        if self._future:
+            self._future.cancel()
         
-        if self.thread:
-            self.thread.join(timeout=5)
+        if self._owns_hub:
+            self.hub.stop()
     
     def register_callback(self, callback):
         """
@@ -130,7 +172,32 @@ class BinanceFeed:
         Args:
             callback: Function that accepts price as argument
         """
-        self.callbacks.append(callback)
+        # Copy-on-write: the reader thread always sees a complete tuple
+        self.callbacks = self.callbacks + (callback,)
+    
+    @property
+    def price(self):
+        """Latest BTC price (None until the first update)."""
+        return self._state[0]
+    
+    @property
+    def last_update(self):
+        """Monotonic timestamp of the latest price update."""
+        return self._state[1]
+    
+    def wait_for_tick(self, timeout=None):
+        """
+        Block until a new price arrives (single consumer).
+        
+        Args:
+            timeout: Max seconds to wait (None = forever)
+            
+        Returns:
+            True if a tick arrived, False on timeout
+        """
+        arrived = self._tick_event.wait(timeout)
+        self._tick_event.clear()
+        return arrived
     
     def get_price(self):
         """
@@ -139,7 +206,7 @@ class BinanceFeed:
         Returns:
             Current price or None if not available
         """
-        return self.price
+        return self._state[0]
     
     def is_connected(self):
         """Check if feed is connected and receiving data."""
@@ -147,7 +214,8 @@ class BinanceFeed:
             return False
         
         # Check if we received data in last 10 seconds
-        if self.last_update and (time.time() - self.last_update) < 10:
+        last_update = self._state[1]
+        if last_update and (time.monotonic() - last_update) < 10:
             return True
         
         return False
@@ -17,7 +17,7 @@ class PolymarketMakerBot:
         self.running = False
         self.daily_pnl = 0.0
         self.daily_trades = 0
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         
         # Override dry-run if live mode specified
         if live_mode:
@@ -89,7 +89,7 @@ class PolymarketMakerBot:
         self.running = False
         
         # Print final statistics
-        runtime = time.time() - self.start_time
+        runtime = time.monotonic() - self.start_time
         logger.info("")
         logger.info("=" * 60)
         logger.info("Bot Statistics")
@@ -1,5 +1,6 @@
 """Configuration management for Polymarket bot."""
 import os
+import sys
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -15,7 +16,7 @@ class Config:
     WS_URL = os.getenv("POLYMARKET_WS_URL", "wss://ws-subscriptions-clob.polymarket.com/ws/market")
     
     # Binance
-    BINANCE_WS = os.getenv("BINANCE_WS_URL", "wss://stream.binance.com:9443/ws/btcusdt@ticker")
+    BINANCE_WS = os.getenv("BINANCE_WS_URL", "wss://stream.binance.com:9443/ws/btcusdt@bookTicker")
     BINANCE_API = os.getenv("BINANCE_API_URL", "https://api.binance.com")
     
     # Trading
@@ -28,6 +29,7 @@ class Config:
     # Advanced Strategy (15-min markets)
     MIN_EDGE_BPS = int(os.getenv("MIN_EDGE_BPS", "200"))  # Minimum 2% edge to overcome fees
     QUOTE_REFRESH_ON_PRICE_CHANGE = float(os.getenv("QUOTE_REFRESH_ON_PRICE_CHANGE", "0.001"))  # 0.1% price change triggers requote
+    FIFO_TOLERANCE = float(os.getenv("FIFO_TOLERANCE", "0.005"))  # Keep resting orders (and queue priority) if quotes move less than this
     
     # Safety
     MAX_DAILY_LOSS = float(os.getenv("MAX_DAILY_LOSS", "20.0"))
@@ -58,26 +60,26 @@ class Config:
     @classmethod
     def print_config(cls):
         """Print current configuration (masks sensitive data)."""
-        print("=" * 60)
-        print("Bot Configuration")
-        print("=" * 60)
-        print(f"Mode:              {'DRY-RUN' if cls.ENABLE_DRY_RUN else 'LIVE'}")
-        print(f"Initial Capital:   ${cls.INITIAL_CAPITAL:.2f}")
-        print(f"Max Position:      ${cls.MAX_POSITION_SIZE:.2f}")
-        print(f"Spread:            {cls.SPREAD_BPS / 100:.2f}%")
-        print(f"Cancel/Replace:    {cls.CANCEL_REPLACE_INTERVAL}s")
-        print(f"Min Edge:          {cls.MIN_EDGE_BPS / 100:.2f}%")
-        print(f"Max Daily Loss:    ${cls.MAX_DAILY_LOSS:.2f}")
-        print(f"Max Daily Trades:  {cls.MAX_DAILY_TRADES}")
         if cls.PRIVATE_KEY:
-            print(f"Wallet:            {cls.PRIVATE_KEY[:6]}...{cls.PRIVATE_KEY[-4:]}")
+            wallet = f"{cls.PRIVATE_KEY[:6]}...{cls.PRIVATE_KEY[-4:]}"
         else:
-            print(f"Wallet:            Not configured")
-        print("=" * 60)
-
-# Validate on import
-try:
-    Config.validate()
-except ValueError as e:
-    print(f"❌ Configuration error: {e}")
-    print("   Please check your .env file")
+            wallet = "Not configured"
+        
+        # Build the whole block and write it once so it can't interleave with other threads
+        lines = [
+            "=" * 60,
+            "Bot Configuration",
+            "=" * 60,
+            f"Mode:              {'DRY-RUN' if cls.ENABLE_DRY_RUN else 'LIVE'}",
+            f"Initial Capital:   ${cls.INITIAL_CAPITAL:.2f}",
+            f"Max Position:      ${cls.MAX_POSITION_SIZE:.2f}",
+            f"Spread:            {cls.SPREAD_BPS / 100:.2f}%",
+            f"Cancel/Replace:    {cls.CANCEL_REPLACE_INTERVAL}s",
+            f"Min Edge:          {cls.MIN_EDGE_BPS / 100:.2f}%",
+            f"Max Daily Loss:    ${cls.MAX_DAILY_LOSS:.2f}",
+            f"Max Daily Trades:  {cls.MAX_DAILY_TRADES}",
+            f"Wallet:            {wallet}",
+            "=" * 60,
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
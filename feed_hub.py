@@ -0,0 +1,80 @@
+"""Shared asyncio event loop for the bot's WebSocket feeds."""
+import asyncio
+import threading
+from logger import logger
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+class FeedHub:
+    """
+    Runs every WebSocket feed on one background event loop.
+    
+    Feeds (Binance today, Polymarket market data next) register their reader
+    coroutines with add() and are multiplexed on a single selector thread,
+    instead of each owning an OS thread that competes for the GIL.
+    """
+    
+    def __init__(self):
+        """Initialize feed hub (the loop thread starts on first use)."""
+        self.loop = None
+        self.thread = None
+        self.running = False
+        self._ready = threading.Event()
+    
+    def _run(self):
+        """Run the event loop in thread."""
+        self.loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._ready.set()
+        
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+    
+    def start(self):
+        """Start the event loop thread if it is not already running."""
+        if self.running:
+            return
+        
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="feed-hub", daemon=True)
+        self.thread.start()
+        self._ready.wait()
+        
+        logger.info("Feed hub started")
+    
+    def add(self, coro_fn):
+        """
+        Schedule a feed coroutine on the hub loop.
+        
+        Args:
+            coro_fn: Coroutine function taking no arguments
+        
+        Returns:
+            concurrent.futures.Future for the running task (cancel() stops it)
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro_fn(), self.loop)
+    
+    async def _shutdown(self):
+        """Cancel every feed task, then stop the loop."""
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.loop.stop()
+    
+    def stop(self):
+        """Stop all feeds and the event loop thread."""
+        if not self.running:
+            return
+        
+        logger.info("Stopping feed hub...")
+        self.running = False
+        
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        self.thread.join(timeout=5)
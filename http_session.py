@@ -0,0 +1,42 @@
+"""Shared HTTP session setup for REST calls."""
+import socket
+import requests
+from requests.adapters import HTTPAdapter
+
+# Disable Nagle so small request bodies go out immediately, and probe idle
+# pooled connections so a silently dropped one is noticed before the next call
+SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+if hasattr(socket, "TCP_KEEPIDLE"):  # Linux only
+    SOCKET_OPTIONS += [
+        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10),
+    ]
+
+class TCPNoDelayAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets use SOCKET_OPTIONS."""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager with low-latency socket options."""
+        kwargs["socket_options"] = SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+def create_session(pool_connections=4, pool_maxsize=4):
+    """
+    Create a requests Session that keeps HTTPS connections alive.
+    
+    Reusing a pooled connection skips the TCP + TLS handshake on every call.
+    
+    Args:
+        pool_connections: Number of hosts to keep connection pools for
+        pool_maxsize: Max connections kept alive per host
+    
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    session.mount("https://", TCPNoDelayAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize))
+    session.headers["Connection"] = "keep-alive"
+    return session
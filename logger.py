@@ -1,6 +1,9 @@
 """Logging setup for Polymarket bot."""
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 from config import Config
 
@@ -25,8 +28,8 @@ def setup_logger(name="polymarket_bot"):
     )
     console_handler.setFormatter(console_format)
     
-    # File handler (detailed format)
-    file_handler = logging.FileHandler(Config.LOG_FILE)
+    # File handler (detailed format, rotated so the log can't grow unbounded)
+    file_handler = RotatingFileHandler(Config.LOG_FILE, maxBytes=10 * 1024 * 1024, backupCount=5)
     file_handler.setLevel(logging.DEBUG)
     file_format = logging.Formatter(
         '%(asctime)s | %(name)s | %(levelname)-8s | %(funcName)s:%(lineno)d | %(message)s',
@@ -34,8 +37,13 @@ def setup_logger(name="polymarket_bot"):
     )
     file_handler.setFormatter(file_format)
     
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Callers only enqueue records; formatting and I/O run on the listener thread
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    logger.addHandler(QueueHandler(log_queue))
     
     return logger
 
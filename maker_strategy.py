@@ -1,10 +1,27 @@
 """Maker strategy implementation for Polymarket crypto markets."""
+import asyncio
+import logging
+import queue
+import re
+import threading
 import time
-from polymarket_client import PolymarketClient
+from bisect import bisect_right
+from functools import lru_cache
+from polymarket_client import MARKET_REFRESH_INTERVAL, PolymarketClient
 from binance_feed import BinanceFeed
 from config import Config
+from feed_hub import FeedHub
 from logger import logger
 
+# Strike price patterns like "$83,000" or "$83000"
+_STRIKE_RE = re.compile(r'\$([0-9,]+)')
+
+@lru_cache(maxsize=32)
+def _parse_strike_price(question):
+    """Parse the strike price from a market question (memoized per question)."""
+    match = _STRIKE_RE.search(question)
+    return float(match.group(1).replace(",", "")) if match else None
+
 class MakerStrategy:
     """
     Market maker strategy for Polymarket crypto markets.
@@ -17,6 +34,18 @@ class MakerStrategy:
     5. Earn maker rebates on filled orders
     """
     
+    # Fair price slope inside the ±$100 band: 0.10 per $100
+    _LINEAR_SLOPE = 0.001
+    
+    # Fair price steps outside the band, indexed by |diff| bucket: $100+, $300+, $500+
+    _FAIR_STEP_BREAKS = (300, 500)
+    _FAIR_ABOVE = (0.60, 0.75, 0.90)
+    _FAIR_BELOW = (0.40, 0.25, 0.10)
+    
+    # Failed cancel batches are re-queued this many times, backing off between tries
+    _CANCEL_MAX_RETRIES = 3
+    _CANCEL_RETRY_DELAY = 0.5  # seconds, multiplied by the attempt number
+    
     def __init__(self, client: PolymarketClient, target_market_duration="15m"):
         """
         Initialize maker strategy.
@@ -27,12 +56,16 @@ class MakerStrategy:
         """
         self.client = client
         self.target_market_duration = target_market_duration
-        self.binance_feed = BinanceFeed(symbol="BTCUSDT")
+        # All WebSocket feeds share one event loop thread
+        self.feed_hub = FeedHub()
+        self.binance_feed = BinanceFeed(symbol="BTCUSDT", hub=self.feed_hub)
         
         # Active market tracking
         self.active_market = None
         self.active_token_id = None
-        self.current_orders = []
+        self.active_strike_price = None  # Parsed once per market
+        self._quoter = None  # Quote math specialized for the active market
+        self.current_orders = {}  # Side -> {"id", "price", "size"} of the resting order
         self.last_btc_price = None  # Track last price for change detection
         
         # Performance tracking
@@ -40,8 +73,29 @@ class MakerStrategy:
         self.total_pnl = 0.0
         self.last_cancel_replace = 0
         
+        # Stale order IDs waiting to be cancelled off the quoting path (see _cancel_worker)
+        self._cancel_queue = queue.Queue()
+        self._cancel_thread = threading.Thread(target=self._cancel_worker, name="cancel-worker", daemon=True)
+        self._cancel_thread.start()
+        
+        # Quoting constants derived from Config (see reload_config)
+        self.reload_config()
+        
         logger.info(f"Maker strategy initialized for {target_market_duration} markets")
     
+    def reload_config(self):
+        """Recompute quoting constants from Config (call after changing Config at runtime)."""
+        self._min_edge = Config.MIN_EDGE_BPS / 10000.0
+        self._half_spread = Config.SPREAD_BPS / 20000.0
+        self._position_size = Config.MAX_POSITION_SIZE
+        self._fifo_tolerance = Config.FIFO_TOLERANCE
+        self._cancel_interval = Config.CANCEL_REPLACE_INTERVAL
+        self._price_thresh = Config.QUOTE_REFRESH_ON_PRICE_CHANGE
+        
+        # Re-specialize the quoter so it picks up the new spread
+        if self.active_strike_price:
+            self._quoter = self._build_quoter()
+    
     def start(self):
         """Start the strategy."""
         logger.info("Starting maker strategy...")
@@ -58,17 +112,31 @@ class MakerStrategy:
         if not self.active_market:
             raise RuntimeError(f"No active {self.target_market_duration} BTC markets found")
         
+        # Keep the tick size fresh off the quoting path
+        self.feed_hub.add(self._refresh_market_loop)
+        
         logger.info(f"✅ Trading market: {self.active_market.get('question', 'Unknown')}")
     
+    async def _refresh_market_loop(self):
+        """Re-resolve the active market's tick size ahead of ClobClient's cache expiry."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(MARKET_REFRESH_INTERVAL)
+            if self.active_token_id:
+                await loop.run_in_executor(None, self.client.prepare_market, self.active_token_id)
+    
     def stop(self):
         """Stop the strategy."""
         logger.info("Stopping maker strategy...")
         
-        # Cancel all open orders
+        # Retire the cancel worker, then cancel all open orders
+        self._cancel_queue.put(None)
+        self._cancel_thread.join(timeout=5)
         self.client.cancel_all_orders()
         
-        # Stop price feed
+        # Stop price feed and the shared feed loop
         self.binance_feed.stop()
+        self.feed_hub.stop()
         
         logger.info("✅ Strategy stopped")
     
@@ -89,8 +157,51 @@ class MakerStrategy:
             # Pick YES token (index 0 usually)
             self.active_token_id = tokens[0].get("token_id")
         
+        # Strike never changes for a given market, so parse it once here
+        self.active_strike_price = self.extract_strike_price(self.active_market.get("question", ""))
+        
         logger.info(f"Selected market: {self.active_market.get('question', 'N/A')}")
         logger.info(f"Token ID: {self.active_token_id[:16] if self.active_token_id else 'N/A'}...")
+        
+        # Resolve fee rate, tick size and neg-risk now so the first quote only signs and posts
+        if self.active_token_id:
+            self.client.prepare_market(self.active_token_id)
+        
+        if self.active_strike_price:
+            logger.info(f"Strike price: ${self.active_strike_price:,.0f}")
+            self._quoter = self._build_quoter()
+        else:
+            logger.warning("Could not extract strike price from market question")
+            self._quoter = None
+    
+    def _build_quoter(self):
+        """
+        Specialize the quote math for the active market.
+        
+        Binds the strike, half spread and fair-price function into a closure so
+        each requote does no attribute or Config lookups.
+        
+        Returns:
+            Function mapping BTC price to (fair_price, buy_price, sell_price)
+        """
+        strike_price = self.active_strike_price
+        half_spread = self._half_spread
+        fair_price_fn = self.calculate_fair_price
+        
+        def quote(btc_price):
+            fair_price = fair_price_fn(btc_price, strike_price)
+            
+            # Fair price is within [0.10, 0.90], so each side can only cross one bound
+            buy_price = fair_price - half_spread
+            if buy_price < 0.01:
+                buy_price = 0.01
+            sell_price = fair_price + half_spread
+            if sell_price > 0.99:
+                sell_price = 0.99
+            
+            return fair_price, buy_price, sell_price
+        
+        return quote
     
     def should_requote(self, current_btc_price):
         """
@@ -104,22 +215,15 @@ class MakerStrategy:
         Returns:
             True if should requote
         """
-        # Always requote if we haven't quoted yet
-        if self.last_btc_price is None:
-            return True
-        
-        # Check time-based interval
-        elapsed = time.time() - self.last_cancel_replace
-        if elapsed >= Config.CANCEL_REPLACE_INTERVAL:
-            return True
+        last_price = self.last_btc_price
         
-        # Check price change threshold (article: requote on price movement)
-        price_change_pct = abs(current_btc_price - self.last_btc_price) / self.last_btc_price
-        if price_change_pct >= Config.QUOTE_REFRESH_ON_PRICE_CHANGE:
-            logger.info(f"Price changed {price_change_pct*100:.2f}% - triggering requote")
+        # Always requote if we haven't quoted yet
+        if last_price is None:
             return True
         
-        return False
+        # Time-based interval, or price change threshold (article: requote on price movement)
+        return (time.monotonic() - self.last_cancel_replace >= self._cancel_interval
+                or abs(current_btc_price - last_price) >= last_price * self._price_thresh)
     
     def calculate_fair_price(self, btc_price, strike_price, market_close_time=None):
         """
@@ -139,37 +243,20 @@ class MakerStrategy:
         # Calculate price difference
         diff = btc_price - strike_price
         
+        # Small difference (common case): linear scale from 0.40 to 0.60 across ±$100
+        if -100 < diff < 100:
+            return 0.50 + diff * self._LINEAR_SLOPE
+        
         # For 15-min markets: Use aggressive pricing model
         # If BTC is $100 above strike → ~60% probability
         # If BTC is $500 above strike → ~90% probability
+        # Every step lies inside [0.01, 0.99], so no clamp is needed
         if diff > 0:
             # Above strike - higher YES probability
-            if diff >= 500:
-                fair_price = 0.90
-            elif diff >= 300:
-                fair_price = 0.75
-            elif diff >= 100:
-                fair_price = 0.60
-            else:
-                # Small difference: linear scale from 0.50 to 0.60
-                fair_price = 0.50 + (diff / 100) * 0.10
-        else:
-            # Below strike - lower YES probability
-            abs_diff = abs(diff)
-            if abs_diff >= 500:
-                fair_price = 0.10
-            elif abs_diff >= 300:
-                fair_price = 0.25
-            elif abs_diff >= 100:
-                fair_price = 0.40
-            else:
-                # Small difference: linear scale from 0.50 to 0.40
-                fair_price = 0.50 - (abs_diff / 100) * 0.10
+            return self._FAIR_ABOVE[bisect_right(self._FAIR_STEP_BREAKS, diff)]
         
-        # Clamp to valid range [0.01, 0.99]
-        fair_price = max(0.01, min(0.99, fair_price))
-        
-        return fair_price
+        # Below strike - lower YES probability
+        return self._FAIR_BELOW[bisect_right(self._FAIR_STEP_BREAKS, -diff)]
     
     def quote_orders(self):
         """
@@ -188,21 +275,23 @@ class MakerStrategy:
             logger.warning("No BTC price available, skipping quote")
             return
         
-        # Parse strike price from market question
-        question = self.active_market.get("question", "")
-        strike_price = self.extract_strike_price(question)
+        # Strike price is parsed once in find_active_market
+        strike_price = self.active_strike_price
         
-        if not strike_price:
+        if not self._quoter:
             logger.error("Could not extract strike price from market question")
+            # Count the skip as a requote so the interval throttles this log
+            self.last_cancel_replace = time.monotonic()
+            self.last_btc_price = btc_price
             return
         
-        # Calculate fair YES price
-        fair_price = self.calculate_fair_price(btc_price, strike_price)
+        # Calculate fair YES price and spread quotes (specialized per market)
+        fair_price, buy_price, sell_price = self._quoter(btc_price)
         
         # CRITICAL: Check if we have enough edge to overcome fees
         # Article: Max fee is 1.56% at p=0.50
         # We need edge > 2% to be safe (MIN_EDGE_BPS = 200)
-        min_edge = Config.MIN_EDGE_BPS / 10000.0
+        min_edge = self._min_edge
         
         # Check distance from 50% (danger zone)
         distance_from_50 = abs(fair_price - 0.50)
@@ -211,65 +300,136 @@ class MakerStrategy:
             logger.warning(f"Fair price {fair_price:.3f} too close to 50% (high fee zone) - skipping")
             logger.warning(f"Need at least {min_edge*100:.1f}% edge, have {distance_from_50*100:.1f}%")
             # Cancel existing orders but don't place new ones
-            for order_id in self.current_orders:
-                self.client.cancel_order(order_id)
+            for order in self.current_orders.values():
+                self._cancel_queue.put(order["id"])
             self.current_orders.clear()
+            # Count the skip as a requote so the interval throttles these warnings
+            self.last_cancel_replace = time.monotonic()
+            self.last_btc_price = btc_price
             return
         
-        # Apply spread
-        spread_bps = Config.SPREAD_BPS
-        spread = spread_bps / 10000.0
-        
-        buy_price = fair_price - spread / 2
-        sell_price = fair_price + spread / 2
-        
-        # Clamp to valid range
-        buy_price = max(0.01, min(0.99, buy_price))
-        sell_price = max(0.01, min(0.99, sell_price))
-        
         # Position size
-        position_size = Config.MAX_POSITION_SIZE
+        position_size = self._position_size
+        
+        # Re-posting an unchanged quote forfeits FIFO queue priority, so only
+        # replace the sides whose price moved by at least the tolerance
+        desired = {"BUY": (buy_price, position_size), "SELL": (sell_price, position_size)}
+        stale_sides = []
+        for side, (price, size) in desired.items():
+            order = self.current_orders.get(side)
+            if not order or order["size"] != size or abs(price - order["price"]) >= self._fifo_tolerance:
+                stale_sides.append(side)
+        
+        if not stale_sides:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Quotes moved < {self._fifo_tolerance:.4f} - keeping resting orders")
+            self.last_cancel_replace = time.monotonic()
+            self.last_btc_price = btc_price
+            return
         
         logger.info(f"BTC: ${btc_price:,.2f} | Strike: ${strike_price:,.0f} | Fair: ${fair_price:.3f}")
-        logger.info(f"Edge: {distance_from_50*100:.1f}% | Quoting: BUY ${buy_price:.3f} | SELL ${sell_price:.3f}")
-        
-        # STEP 1: Cancel existing orders (article: fast cancel/replace)
-        cancel_start = time.time()
-        for order_id in self.current_orders:
-            self.client.cancel_order(order_id)
-        self.current_orders.clear()
-        cancel_time_ms = (time.time() - cancel_start) * 1000
-        
-        # STEP 2: Create new maker orders (article: post on both sides)
-        create_start = time.time()
-        buy_order_id = self.client.create_maker_order(
-            token_id=self.active_token_id,
-            side="BUY",
-            price=buy_price,
-            size=position_size
-        )
-        
-        sell_order_id = self.client.create_maker_order(
+        logger.info(f"Edge: {distance_from_50*100:.1f}% | Quoting: BUY ${buy_price:.3f} | SELL ${sell_price:.3f} (replacing {'+'.join(stale_sides)})")
+        
+        # STEP 1: Hand stale orders to the cancel worker (article: fast cancel/replace)
+        # STEP 2: Create their replacements in one batched request
+        # Only the create is on the critical path: new orders claim queue position
+        # while the cancels are acked in the background. Until the cancel lands,
+        # each replaced side briefly rests twice its size (over MAX_POSITION_SIZE,
+        # with collateral reserved for both orders)
+        for side in stale_sides:
+            if side in self.current_orders:
+                self._cancel_queue.put(self.current_orders.pop(side)["id"])
+        
+        order_ids, create_time_ms = self._timed(
+            self.client.create_maker_orders,
             token_id=self.active_token_id,
-            side="SELL",
-            price=sell_price,
-            size=position_size
+            orders=[(side, *desired[side]) for side in stale_sides]
         )
-        create_time_ms = (time.time() - create_start) * 1000
+        now = time.monotonic()
         
         # Track new orders
-        if buy_order_id:
-            self.current_orders.append(buy_order_id)
-        if sell_order_id:
-            self.current_orders.append(sell_order_id)
+        for side, order_id in zip(stale_sides, order_ids):
+            if order_id:
+                price, size = desired[side]
+                self.current_orders[side] = {"id": order_id, "price": price, "size": size}
         
-        total_loop_ms = cancel_time_ms + create_time_ms
-        logger.debug(f"Cancel/replace loop: {total_loop_ms:.0f}ms (cancel: {cancel_time_ms:.0f}ms, create: {create_time_ms:.0f}ms)")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Cancel/replace loop: {create_time_ms:.0f}ms create ({self._cancel_queue.qsize()} cancels queued)")
         
         # Update tracking
-        self.last_cancel_replace = time.time()
+        self.last_cancel_replace = now
         self.last_btc_price = btc_price
     
+    def _cancel_worker(self):
+        """
+        Cancel stale orders in the background until stop() sends None.
+        
+        Everything queued while the previous cancel was in flight goes out
+        together in one batched request. A failed batch is re-queued up to
+        _CANCEL_MAX_RETRIES times, since its orders are no longer tracked in
+        current_orders and would otherwise stay live until shutdown.
+        """
+        attempts = {}  # order_id -> failed cancel attempts so far
+        
+        while True:
+            batch = [self._cancel_queue.get()]
+            while True:
+                try:
+                    batch.append(self._cancel_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # Dedupe: dry-run ids (and re-queued retries) can repeat within a batch
+            order_ids = list(dict.fromkeys(order_id for order_id in batch if order_id is not None))
+            if None in batch:
+                # stop() follows up with cancel_all, which covers anything left here
+                return
+            
+            # This thread is the only cancel path, so never let one batch kill it
+            try:
+                self._cancel_batch(order_ids, attempts)
+            except Exception as e:
+                logger.error(f"Cancel worker error on {len(order_ids)} orders: {e}", exc_info=True)
+    
+    def _cancel_batch(self, order_ids, attempts):
+        """
+        Cancel one batch for _cancel_worker, re-queueing it on failure.
+        
+        Args:
+            order_ids: Unique order IDs to cancel
+            attempts: Worker-owned dict of order_id -> failed attempts so far
+        """
+        cancelled, cancel_time_ms = self._timed(self.client.cancel_orders, order_ids)
+        
+        if cancelled:
+            for order_id in order_ids:
+                attempts.pop(order_id, None)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Cancelled {len(order_ids)} stale orders in {cancel_time_ms:.0f}ms ({self._cancel_queue.qsize()} still queued)")
+            return
+        
+        retries = {}  # order_id -> attempt number of the upcoming retry
+        for order_id in order_ids:
+            failures = attempts.get(order_id, 0) + 1
+            if failures > self._CANCEL_MAX_RETRIES:
+                attempts.pop(order_id, None)
+                logger.error(f"❌ Giving up cancelling order {order_id[:8]} after {self._CANCEL_MAX_RETRIES} retries - it may still be resting")
+            else:
+                attempts[order_id] = failures
+                retries[order_id] = failures
+        
+        if retries:
+            time.sleep(self._CANCEL_RETRY_DELAY * max(retries.values()))
+            for order_id in retries:
+                self._cancel_queue.put(order_id)
+    
+    @staticmethod
+    def _timed(fn, *args, **kwargs):
+        """Call fn and return (result, elapsed_ms)."""
+        start = time.monotonic()
+        result = fn(*args, **kwargs)
+        return result, (time.monotonic() - start) * 1000
+    
     def extract_strike_price(self, question):
         """
         Extract strike price from market question.
@@ -282,16 +442,7 @@ class MakerStrategy:
         Returns:
             Strike price as float, or None if not found
         """
-        import re
-        
-        # Look for patterns like "$83,000" or "$83000"
-        match = re.search(r'\$([0-9,]+)', question)
-        
-        if match:
-            price_str = match.group(1).replace(",", "")
-            return float(price_str)
-        
-        return None
+        return _parse_strike_price(question)
     
     def run(self):
         """
@@ -313,15 +464,15 @@ class MakerStrategy:
             logger.info("- Min edge required: {:.1f}%".format(Config.MIN_EDGE_BPS / 100))
             
             while True:
+                # Block until a Binance tick arrives (or the requote interval elapses)
+                self.binance_feed.wait_for_tick(timeout=self._cancel_interval)
+                
                 # Get current BTC price
                 btc_price = self.binance_feed.get_price()
                 
                 if btc_price and self.should_requote(btc_price):
                     self.quote_orders()
                 
-                # Sleep briefly (article: tight loop for 15-min markets)
-                time.sleep(0.5)
-                
         except KeyboardInterrupt:
             logger.info("Received stop signal")
         except Exception as e:
@@ -1,11 +1,20 @@
 """Polymarket CLOB client wrapper with fee-aware signing."""
-import requests
+import logging
 import time
+import msgspec
 from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import OrderArgs, OrderType
+from py_clob_client.clob_types import OrderArgs, OrderType, PartialCreateOrderOptions, PostOrdersArgs
 from config import Config
+from http_session import create_session
 from logger import logger
 
+# Fee rates are effectively static over a market's lifetime
+FEE_RATE_TTL = 60  # seconds
+
+# prepare_market is re-run this often in the background, well inside ClobClient's
+# 300s tick-size TTL, so the quoting path never has to fetch the tick size
+MARKET_REFRESH_INTERVAL = 30  # seconds
+
 class PolymarketClient:
     """Wrapper for Polymarket CLOB API with fee-aware order signing."""
     
@@ -19,6 +28,19 @@ class PolymarketClient:
         self.private_key = private_key
         self.client = None
         
+        # Persistent HTTP session so REST calls reuse keep-alive connections
+        # (ClobClient keeps its own pooled HTTP/2 client for order traffic)
+        self.session = create_session()
+        
+        # token_id -> (fetched_at, fee_bps), see get_fee_rate
+        self._fee_cache = {}
+        
+        # Gamma query -> (conditional request headers, markets), see get_markets
+        self._markets_cache = {}
+        
+        # token_id -> PartialCreateOrderOptions resolved at market selection, see prepare_market
+        self._order_options = {}
+        
         if private_key:
             try:
                 self.client = ClobClient(
@@ -36,12 +58,16 @@ class PolymarketClient:
         else:
             logger.warning("Running in dry-run mode (no Polymarket client)")
     
-    def get_markets(self, active=True):
+    def get_markets(self, active=True, **filters):
         """
         Fetch available markets.
         
+        Revalidates with ETag / Last-Modified, so an unchanged list is not
+        downloaded or parsed again.
+        
         Args:
-            active: If True, only return active markets
+            active: If True, only return active, not yet closed markets
+            **filters: Extra Gamma API query parameters (e.g. limit, offset, tag_id)
             
         Returns:
             List of market dictionaries
@@ -49,14 +75,39 @@ class PolymarketClient:
         try:
             # Use Gamma Markets API (CLOB API doesn't have /markets endpoint)
             url = "https://gamma-api.polymarket.com/markets"
-            response = requests.get(url, timeout=10)
+            
+            # Filter server-side so we don't download and parse every market
+            params = dict(filters)
+            if active:
+                params.update(active="true", closed="false")
+            
+            # Conditional GET: an unchanged list comes back as an empty 304
+            cache_key = repr(sorted(params.items()))
+            cached = self._markets_cache.get(cache_key)
+            headers = cached[0] if cached else None
+            
+            response = self.session.get(url, params=params, headers=headers, timeout=10)
+            
+            if response.status_code == 304 and cached:
+                logger.debug(f"Markets unchanged, reusing {len(cached[1])} cached")
+                return cached[1]
+            
             response.raise_for_status()
             
-            markets = response.json()
+            markets = msgspec.json.decode(response.content)
             
             if active:
+                # Cheap safety net on the already-filtered list
                 markets = [m for m in markets if m.get("active", False)]
             
+            validators = {}
+            if "ETag" in response.headers:
+                validators["If-None-Match"] = response.headers["ETag"]
+            if "Last-Modified" in response.headers:
+                validators["If-Modified-Since"] = response.headers["Last-Modified"]
+            if validators:
+                self._markets_cache[cache_key] = (validators, markets)
+            
             logger.debug(f"Fetched {len(markets)} markets")
             return markets
             
@@ -88,7 +139,7 @@ class PolymarketClient:
     
     def get_fee_rate(self, token_id):
         """
-        Query current fee rate for a token/market.
+        Query current fee rate for a token/market (cached for FEE_RATE_TTL seconds).
         
         CRITICAL: feeRateBps MUST be included in order signing for fee-enabled markets.
         
@@ -98,22 +149,60 @@ class PolymarketClient:
         Returns:
             Fee rate in basis points (int) or 0 if no fees
         """
+        cached = self._fee_cache.get(token_id)
+        if cached and time.monotonic() - cached[0] < FEE_RATE_TTL:
+            return cached[1]
+        
         try:
             url = f"{Config.CLOB_URL}/fee-rate"
             params = {"tokenID": token_id}
-            response = requests.get(url, params=params, timeout=5)
+            response = self.session.get(url, params=params, timeout=(1, 3))
             response.raise_for_status()
             
-            data = response.json()
+            data = msgspec.json.decode(response.content)
             fee_bps = int(data.get("base_fee", 0))
+            self._fee_cache[token_id] = (time.monotonic(), fee_bps)
             
-            logger.debug(f"Token {token_id[:8]}...: {fee_bps} bps fee")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Token {token_id[:8]}...: {fee_bps} bps fee")
             return fee_bps
             
         except Exception as e:
             logger.warning(f"Failed to get fee rate: {e}, assuming 0")
             return 0
     
+    def prepare_market(self, token_id):
+        """
+        Resolve a market's signing inputs before it is quoted.
+        
+        Warms ClobClient's fee-rate, tick-size and neg-risk caches and pins tick
+        size / neg-risk as order options, so signing a requote never has to
+        fetch them. Call again every MARKET_REFRESH_INTERVAL to keep the tick
+        size current (ClobClient caches the fee rate for its lifetime).
+        
+        Args:
+            token_id: Token ID about to be quoted
+        """
+        if not self.client:
+            return
+        
+        try:
+            # The order book response overwrites the cached tick size in place;
+            # clearing the cache first would leave a gap where the quoting
+            # thread has to fetch it itself
+            self.client.get_order_book(token_id)
+        except Exception as e:
+            logger.warning(f"Failed to refresh tick size for {token_id[:8]}...: {e}")
+        
+        try:
+            self._order_options[token_id] = PartialCreateOrderOptions(
+                tick_size=self.client.get_tick_size(token_id),
+                neg_risk=self.client.get_neg_risk(token_id),
+            )
+            self.client.get_fee_rate_bps(token_id)
+        except Exception as e:
+            logger.warning(f"Failed to prepare market {token_id[:8]}...: {e}")
+    
     def create_maker_order(self, token_id, side, price, size):
         """
         Create a maker order with fee-aware signing.
@@ -157,6 +246,60 @@ class PolymarketClient:
             logger.error(f"Failed to create order: {e}")
             return None
     
+    def create_maker_orders(self, token_id, orders):
+        """
+        Create several maker orders in one batched CLOB request.
+        
+        Args:
+            token_id: Token ID to trade
+            orders: List of (side, price, size) tuples
+            
+        Returns:
+            List of order IDs aligned with `orders` (None where an order failed)
+        """
+        if not self.client:
+            for side, price, size in orders:
+                logger.info(f"[DRY-RUN] Would create {side} order: {size} shares @ ${price:.3f}")
+            return [f"dry-run-order-{int(time.time())}" for _ in orders]
+        
+        try:
+            # ClobClient.create_order validates feeRateBps against its own cached
+            # market fee rate, so sign with that same value (cached by prepare_market)
+            fee_rate_bps = self.client.get_fee_rate_bps(token_id)
+            
+            # Options pinned by prepare_market (None falls back to ClobClient lookups)
+            options = self._order_options.get(token_id)
+            
+            # Sign every order, then post them all in a single request
+            batch = [
+                PostOrdersArgs(
+                    order=self.client.create_order(OrderArgs(
+                        token_id=token_id,
+                        price=price,
+                        size=size,
+                        side=side,
+                        fee_rate_bps=fee_rate_bps,  # CRITICAL: Must include this
+                    ), options),
+                    orderType=OrderType.GTC,
+                )
+                for side, price, size in orders
+            ]
+            responses = self.client.post_orders(batch)
+            
+            order_ids = []
+            for (side, price, size), response in zip(orders, responses):
+                order_id = response.get("orderID") or None
+                if order_id:
+                    logger.info(f"✅ Created {side} order {order_id[:8]}: {size} @ ${price:.3f}")
+                else:
+                    logger.error(f"Failed to create {side} order: {response.get('errorMsg', 'unknown error')}")
+                order_ids.append(order_id)
+            return order_ids
+            
+        except Exception as e:
+            logger.error(f"Failed to create orders: {e}")
+            return [None] * len(orders)
+    
     def cancel_order(self, order_id):
         """
         Cancel an existing order.
@@ -179,6 +322,32 @@ class PolymarketClient:
             logger.warning(f"Failed to cancel order {order_id[:8]}: {e}")
             return False
     
+    def cancel_orders(self, order_ids):
+        """
+        Cancel several orders in one batched CLOB request.
+        
+        Args:
+            order_ids: Order IDs to cancel
+            
+        Returns:
+            True if successful
+        """
+        if not order_ids:
+            return True
+        
+        if not self.client:
+            logger.info(f"[DRY-RUN] Would cancel {len(order_ids)} orders")
+            return True
+        
+        try:
+            self.client.cancel_orders(list(order_ids))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Cancelled {len(order_ids)} orders")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to cancel {len(order_ids)} orders: {e}")
+            return False
+    
     def cancel_all_orders(self):
         """Cancel all open orders."""
         if not self.client:
@@ -186,10 +355,9 @@ class PolymarketClient:
             return
         
         try:
-            open_orders = self.client.get_orders()
-            for order in open_orders:
-                self.cancel_order(order["id"])
-            logger.info(f"Cancelled {len(open_orders)} orders")
+            # Single server-side cancel instead of listing and cancelling one by one
+            response = self.client.cancel_all()
+            logger.info(f"Cancelled {len(response.get('canceled', []))} orders")
         except Exception as e:
             logger.error(f"Failed to cancel all orders: {e}")
     
@@ -7,6 +7,7 @@ YOU MUST RUN THIS BEFORE LIVE TRADING or orders will fail with "insufficient all
 This is ONLY needed for MetaMask/hardware wallets. Email/Magic wallets handle this automatically.
 """
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from web3 import Web3
 from eth_account import Account
 from config import Config
@@ -21,6 +22,9 @@ EXCHANGE_CONTRACT = "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E"
 NEG_RISK_CTF = "0xC5d563A36AE78145C45a50134d48A1215220f80a"
 NEG_RISK_ADAPTER = "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296"
 
+# Multicall3 (same address on every EVM chain) batches read calls into one eth_call
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
 # ERC20 ABI (approve function only)
 ERC20_ABI = [
     {
@@ -45,6 +49,36 @@ ERC20_ABI = [
     }
 ]
 
+# Multicall3 ABI (aggregate3 function only)
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
 def setup_allowances():
     """Set token allowances for trading contracts."""
     
@@ -98,66 +132,106 @@ def setup_allowances():
     logger.info("=" * 60)
     logger.info("Setting Token Allowances")
     logger.info("=" * 60)
-    logger.info("This will submit 6 transactions (3 contracts × 2 tokens)")
+    logger.info("This checks 6 allowances (3 contracts × 2 tokens) and submits")
+    logger.info("one transaction per missing approval")
     logger.info("Each transaction requires gas (typically ~0.01 MATIC)")
     logger.info("=" * 60)
     logger.info("")
     
     input("Press ENTER to continue or Ctrl+C to cancel... ")
     
-    total_txns = 0
+    # Read every current allowance in a single Multicall3 eth_call
+    token_contracts = [w3.eth.contract(address=token_address, abi=ERC20_ABI) for _, token_address in tokens]
+    multicall = w3.eth.contract(address=MULTICALL3, abi=MULTICALL3_ABI)
+    
+    results = iter(multicall.functions.aggregate3([
+        (token_contract.address, True, token_contract.encode_abi("allowance", args=[wallet_address, contract_address]))
+        for token_contract in token_contracts
+        for _, contract_address in contracts
+    ]).call())
     
-    for token_name, token_address in tokens:
+    # Collect the approvals that are still needed
+    pending = []
+    
+    for (token_name, token_address), token_contract in zip(tokens, token_contracts):
         logger.info("")
         logger.info(f"Processing {token_name} ({token_address[:8]}...)")
         
-        token_contract = w3.eth.contract(address=token_address, abi=ERC20_ABI)
-        
         for contract_name, contract_address in contracts:
-            # Check current allowance
-            current_allowance = token_contract.functions.allowance(
-                wallet_address,
-                contract_address
-            ).call()
+            # A failed read means the token can't be approved this way: never send a blind approve
+            success, return_data = next(results)
+            if not success or len(return_data) < 32:
+                logger.error(f"  ❌ {contract_name}: allowance() call failed - skipping")
+                continue
+            
+            current_allowance = w3.codec.decode(["uint256"], return_data)[0]
             
             if current_allowance >= max_approval // 2:
                 logger.info(f"  ✅ {contract_name}: Already approved")
                 continue
             
-            logger.info(f"  📝 {contract_name}: Setting allowance...")
+            pending.append((f"{token_name} → {contract_name}", token_contract, contract_address))
+    
+    # Sign every approval up front with consecutive nonces and broadcast them all,
+    # so confirmations overlap instead of waiting for each one in turn
+    logger.info("")
+    logger.info(f"Submitting {len(pending)} approval transaction(s)...")
+    base_nonce = w3.eth.get_transaction_count(wallet_address)
+    gas_price = w3.eth.gas_price
+    sent = []
+    
+    for label, token_contract, contract_address in pending:
+        logger.info(f"  📝 {label}: Setting allowance...")
+        
+        try:
+            # Build transaction
+            txn = token_contract.functions.approve(
+                contract_address,
+                max_approval
+            ).build_transaction({
+                'from': wallet_address,
+                'nonce': base_nonce + len(sent),
+                'gas': 100000,
+                'gasPrice': gas_price
+            })
+            
+            # Sign transaction
+            signed_txn = account.sign_transaction(txn)
+            
+            # Send transaction
+            tx_hash = w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+            
+            logger.info(f"     TX: {tx_hash.hex()}")
+            sent.append((label, tx_hash))
+            
+        except Exception as e:
+            logger.error(f"  ❌ {label}: {e}")
+    
+    total_txns = 0
+    
+    if sent:
+        logger.info("")
+        logger.info(f"Waiting for {len(sent)} confirmations...")
+        
+        # Wait for all receipts in parallel
+        with ThreadPoolExecutor(max_workers=len(sent)) as executor:
+            receipts = [
+                (label, executor.submit(w3.eth.wait_for_transaction_receipt, tx_hash, timeout=120))
+                for label, tx_hash in sent
+            ]
             
-            try:
-                # Build transaction
-                txn = token_contract.functions.approve(
-                    contract_address,
-                    max_approval
-                ).build_transaction({
-                    'from': wallet_address,
-                    'nonce': w3.eth.get_transaction_count(wallet_address),
-                    'gas': 100000,
-                    'gasPrice': w3.eth.gas_price
-                })
-                
-                # Sign transaction
-                signed_txn = account.sign_transaction(txn)
-                
-                # Send transaction
-                tx_hash = w3.eth.send_raw_transaction(signed_txn.raw_transaction)
-                
-                logger.info(f"     TX: {tx_hash.hex()}")
-                logger.info(f"     Waiting for confirmation...")
-                
-                # Wait for receipt
-                receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-                
-                if receipt['status'] == 1:
-                    logger.info(f"  ✅ {contract_name}: Approved!")
-                    total_txns += 1
-                else:
-                    logger.error(f"  ❌ {contract_name}: Transaction failed")
-                
-            except Exception as e:
-                logger.error(f"  ❌ {contract_name}: {e}")
+            for label, future in receipts:
+                try:
+                    receipt = future.result()
+                    
+                    if receipt['status'] == 1:
+                        logger.info(f"  ✅ {label}: Approved!")
+                        total_txns += 1
+                    else:
+                        logger.error(f"  ❌ {label}: Transaction failed")
+                        
+                except Exception as e:
+                    logger.error(f"  ❌ {label}: {e}")
     
     logger.info("")
     logger.info("=" * 60)
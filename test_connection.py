@@ -1,26 +1,62 @@
 #!/usr/bin/env python3
 """Test Polymarket connectivity without requiring wallet."""
-import requests
+import statistics
 import time
+from concurrent.futures import ThreadPoolExecutor
+import msgspec
 from config import Config
+from http_session import create_session
+
+# One keep-alive session shared by every probe
+session = create_session()
+
+# Timed requests per probe (after one untimed warm-up request)
+SAMPLES = 10
+
+def sample_latency(request_fn, samples=SAMPLES):
+    """
+    Time repeated requests over a warm keep-alive connection.
+    
+    The first request opens the connection (TCP + TLS handshake) and is not
+    timed, so the samples reflect the steady state the bot actually sees.
+    
+    Args:
+        request_fn: Function issuing one request and returning the response
+        samples: Number of timed requests
+    
+    Returns:
+        (last response, (p50, p99) latency in ms)
+    """
+    response = request_fn()
+    latencies = []
+    
+    for _ in range(samples):
+        if response.status_code != 200:
+            break
+        start = time.perf_counter()
+        response = request_fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    
+    if len(latencies) < 2:
+        return response, (0, 0)
+    
+    p99 = statistics.quantiles(latencies, n=100, method="inclusive")[98]
+    return response, (statistics.median(latencies), p99)
 
 def test_polygon_rpc():
     """Test Polygon RPC endpoint latency."""
-    print("Testing Polygon RPC...")
     try:
-        start = time.time()
-        response = requests.post(
+        response, (p50, p99) = sample_latency(lambda: session.post(
             Config.POLYGON_RPC,
             json={"jsonrpc":"2.0","method":"eth_blockNumber","params":[],"id":1},
             timeout=5
-        )
-        latency = (time.time() - start) * 1000
+        ))
         
         if response.status_code == 200:
-            data = response.json()
+            data = msgspec.json.decode(response.content)
             block = int(data.get("result", "0x0"), 16) if "result" in data else 0
-            print(f"✅ Polygon RPC: {latency:.0f}ms (Block: {block})")
-            return True, latency
+            print(f"✅ Polygon RPC: p50 {p50:.0f}ms / p99 {p99:.0f}ms (Block: {block})")
+            return True, p50
         else:
             print(f"❌ Polygon RPC returned status {response.status_code}")
             return False, 0
@@ -30,17 +66,16 @@ def test_polygon_rpc():
 
 def test_polymarket_api():
     """Test Polymarket CLOB API endpoint."""
-    print("Testing Polymarket API...")
     try:
-        start = time.time()
-        response = requests.get(f"{Config.CLOB_URL}/markets", timeout=5)
-        latency = (time.time() - start) * 1000
+        response, (p50, p99) = sample_latency(
+            lambda: session.get(f"{Config.CLOB_URL}/markets", timeout=5)
+        )
         
         if response.status_code == 200:
-            data = response.json()
+            data = msgspec.json.decode(response.content)
             markets = len(data.get("data", []))
-            print(f"✅ Polymarket API: {latency:.0f}ms ({markets} markets)")
-            return True, latency
+            print(f"✅ Polymarket API: p50 {p50:.0f}ms / p99 {p99:.0f}ms ({markets} markets)")
+            return True, p50
         else:
             print(f"❌ Polymarket API returned status {response.status_code}")
             return False, 0
@@ -50,20 +85,17 @@ def test_polymarket_api():
 
 def test_binance_api():
     """Test Binance API endpoint."""
-    print("Testing Binance API...")
     try:
-        start = time.time()
-        response = requests.get(
+        response, (p50, p99) = sample_latency(lambda: session.get(
             f"{Config.BINANCE_API}/api/v3/ticker/price?symbol=BTCUSDT",
             timeout=5
-        )
-        latency = (time.time() - start) * 1000
+        ))
         
         if response.status_code == 200:
-            data = response.json()
+            data = msgspec.json.decode(response.content)
             price = float(data.get("price", 0))
-            print(f"✅ Binance API: {latency:.0f}ms (BTC: ${price:,.2f})")
-            return True, latency
+            print(f"✅ Binance API: p50 {p50:.0f}ms / p99 {p99:.0f}ms (BTC: ${price:,.2f})")
+            return True, p50
         else:
             print(f"❌ Binance API returned status {response.status_code}")
             return False, 0
@@ -73,8 +105,8 @@ def test_binance_api():
 
 def estimate_cancel_replace_latency(polygon_lat, poly_lat):
     """Estimate cancel/replace loop latency."""
-    # Cancel + Create both hit Polymarket CLOB
-    estimated = poly_lat * 2
+    # Cancel + Create both hit Polymarket CLOB, but are issued concurrently
+    estimated = poly_lat
     return estimated
 
 def main():
@@ -87,14 +119,16 @@ def main():
     Config.print_config()
     print()
     
-    # Run tests
-    polygon_ok, polygon_lat = test_polygon_rpc()
-    print()
-    
-    poly_ok, poly_lat = test_polymarket_api()
-    print()
-    
-    binance_ok, binance_lat = test_binance_api()
+    # Run the probes concurrently: wall time is the slowest probe, not the sum
+    print(f"Testing Polygon RPC, Polymarket API and Binance API ({SAMPLES} samples each)...")
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        polygon = executor.submit(test_polygon_rpc)
+        poly = executor.submit(test_polymarket_api)
+        binance = executor.submit(test_binance_api)
+        
+        polygon_ok, polygon_lat = polygon.result()
+        poly_ok, poly_lat = poly.result()
+        binance_ok, binance_lat = binance.result()
     print()
     
     # Summary
@@ -108,7 +142,7 @@ def main():
         
         # Estimate performance
         cancel_replace_lat = estimate_cancel_replace_latency(polygon_lat, poly_lat)
-        print(f"Estimated Cancel/Replace Loop: {cancel_replace_lat:.0f}ms")
+        print(f"Estimated Cancel/Replace Loop (p50): {cancel_replace_lat:.0f}ms")
         
         if cancel_replace_lat < 200:
             print("   🟢 EXCELLENT - Highly competitive")